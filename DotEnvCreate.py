@@ -7,7 +7,7 @@ def create_env_file():
     print("Введите данные для подключения к Telegram API:")
     api_id = input("Введите API ID (полученный от my.telegram.org): ").strip()
     api_hash = input("Введите API HASH: ").strip()
-    phone_number = input("Введите номер телефона (в международном формате, например +79012345678): ").strip()
+    phone_number = input("Введите номер телефона (в международном формате, например +79012345678; несколько — через запятую): ").strip()
     password = input("Введите пароль от Telegram (если установлен 2FA, иначе оставьте пустым): ").strip()
 
     print("\nВведите данные для подключения к MySQL:")
@@ -0,0 +1,108 @@
+import threading
+import time
+from sqlalchemy import and_, bindparam, insert, select, tuple_, update
+
+
+class BatchWriter:
+    def __init__(self, engine, model, key_columns, batch_size=100, flush_interval=5, hash_column=None,
+                 update_columns=(), on_update=None):
+        self.engine = engine
+        self.table = model.__table__
+        self.key_columns = [self.table.c[name] for name in key_columns]
+        self.hash_column = self.table.c[hash_column] if hash_column else None
+        self.update_columns = [hash_column, *update_columns] if hash_column else []
+        self.on_update = on_update
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer = []
+        self.buffered_at = None
+        self.updated = 0
+        self.lock = threading.Lock()
+
+    def get_key(self, row):
+        return tuple(row[column.name] for column in self.key_columns)
+
+    def is_flush_due(self):
+        if not self.buffer:
+            return False
+        return (len(self.buffer) >= self.batch_size or
+                time.monotonic() - self.buffered_at >= self.flush_interval)
+
+    def add(self, row):
+        with self.lock:
+            self.buffer.append(row)
+            if self.buffered_at is None:
+                self.buffered_at = time.monotonic()
+            flush_due = self.is_flush_due()
+        return self.flush() if flush_due else []
+
+    def flush(self):
+        with self.lock:
+            rows, self.buffer, self.buffered_at = self.buffer, [], None
+        try:
+            return self.write(rows)
+        except Exception:
+            with self.lock:
+                self.buffer = rows + self.buffer
+                if self.buffered_at is None:
+                    self.buffered_at = time.monotonic()
+            raise
+
+    def write(self, rows):
+        unique_rows = {}
+        for row in rows:
+            key = self.get_key(row)
+            if key not in unique_rows:
+                unique_rows[key] = row
+            elif self.hash_column is not None:
+                unique_rows[key] = {**unique_rows[key], **{name: row[name] for name in self.update_columns}}
+        if not unique_rows:
+            return []
+
+        changed_rows = []
+        with self.engine.begin() as connection:
+            existing_keys = self.find_existing_keys(connection, list(unique_rows))
+            new_rows = [row for key, row in unique_rows.items() if key not in existing_keys]
+            if new_rows:
+                connection.execute(self.get_insert_statement().values(new_rows))
+            if self.hash_column is not None:
+                changed_rows = [row for key, row in unique_rows.items()
+                                if key in existing_keys and existing_keys[key] != row[self.hash_column.name]]
+                self.update_rows(connection, changed_rows)
+        if changed_rows and self.on_update is not None:
+            self.on_update(changed_rows)
+        return new_rows
+
+    def find_existing_keys(self, connection, keys):
+        if len(self.key_columns) == 1:
+            condition = self.key_columns[0].in_([key[0] for key in keys])
+        else:
+            condition = tuple_(*self.key_columns).in_(keys)
+        columns = self.key_columns + ([self.hash_column] if self.hash_column is not None else [])
+        existing_keys = {}
+        for row in connection.execute(select(*columns).where(condition)):
+            existing_keys[tuple(row[:len(self.key_columns)])] = row[-1] if self.hash_column is not None else None
+        return existing_keys
+
+    def update_rows(self, connection, rows):
+        if not rows:
+            return
+
+        key_names = [column.name for column in self.key_columns]
+        value_names = self.update_columns
+        statement = update(self.table).where(
+            and_(*[column == bindparam(f"key_{column.name}") for column in self.key_columns])
+        ).values({name: bindparam(f"value_{name}") for name in value_names})
+        connection.execute(statement, [
+            {**{f"key_{name}": row[name] for name in key_names}, **{f"value_{name}": row[name] for name in value_names}}
+            for row in rows
+        ])
+        self.updated += len(rows)
+
+    def get_insert_statement(self):
+        statement = insert(self.table)
+        if self.engine.dialect.name == 'mysql':
+            return statement.prefix_with('IGNORE')
+        if self.engine.dialect.name == 'sqlite':
+            return statement.prefix_with('OR IGNORE')
+        return statement
@@ -0,0 +1,38 @@
+from utils.JsonStore import JsonStore
+
+
+class ChannelWatermarks:
+    def __init__(self, path, window=100):
+        self.store = JsonStore(path)
+        self.window = window
+        self.recent = {}
+
+    def get_state(self, channel_id):
+        key = str(channel_id)
+        state = self.store.get(key)
+        if state is None:
+            return 0, set()
+        if key not in self.recent:
+            self.recent[key] = set(state['recent'])
+        return state['max_id'], self.recent[key]
+
+    def get_max_id(self, channel_id):
+        return self.get_state(channel_id)[0]
+
+    def is_seen(self, channel_id, message_id):
+        max_id, recent = self.get_state(channel_id)
+        if message_id > max_id:
+            return False
+        return message_id <= max_id - self.window or message_id in recent
+
+    def mark_seen(self, channel_id, message_id):
+        max_id, recent = self.get_state(channel_id)
+        max_id = max(max_id, message_id)
+        recent = {seen_id for seen_id in recent | {message_id} if seen_id > max_id - self.window}
+
+        key = str(channel_id)
+        self.recent[key] = recent
+        self.store.set(key, {'max_id': max_id, 'recent': sorted(recent)})
+
+    def save(self):
+        self.store.save()
@@ -0,0 +1,58 @@
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold, cooldown, max_cooldown):
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.total_failures = 0
+        self.opened_at = None
+
+    def time_until_probe(self):
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.opened_at + self.cooldown - time.monotonic())
+
+    def allow_request(self):
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and self.time_until_probe() == 0:
+            self.state = HALF_OPEN
+            return True
+        return False
+
+    def record_success(self):
+        previous_state = self.state
+        self.state = CLOSED
+        self.failures = 0
+        self.cooldown = self.base_cooldown
+        return previous_state != CLOSED
+
+    def record_failure(self):
+        self.failures += 1
+        self.total_failures += 1
+
+        if self.state == HALF_OPEN:
+            self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+        elif self.state == OPEN or self.failures < self.failure_threshold:
+            return False
+
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        return True
+
+    def get_status(self):
+        return {
+            'state': self.state,
+            'failures': self.failures,
+            'total_failures': self.total_failures,
+            'retry_in': round(self.time_until_probe()),
+        }
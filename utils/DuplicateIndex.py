@@ -0,0 +1,166 @@
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from sqlalchemy import select
+
+WORD_RE = re.compile(r'\w+')
+TAG_RE = re.compile(r'<[^>]+>')
+SHINGLE_SIZE = 3
+MIN_WORDS = 8
+MAX_WORDS = 100
+HASH_MASK = (1 << 64) - 1
+
+
+class DuplicateIndex:
+    def __init__(self, engine, sources, window, threshold=0.5, num_perm=64, bands=16, refresh_interval=60):
+        self.engine = engine
+        self.sources = sources
+        self.window = window
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.bin_bits = num_perm.bit_length() - 1
+        self.refresh_interval = refresh_interval
+        self.entries = {}
+        self.buckets = {}
+        self.order = deque()
+        self.last_ids = {}
+        self.refreshed_at = 0.0
+        self.lock = threading.Lock()
+
+    def get_signature(self, text):
+        words = WORD_RE.findall(TAG_RE.sub(' ', text or '').lower())[:MAX_WORDS]
+        if len(words) < MIN_WORDS:
+            return None
+
+        empty = 1 << 64
+        bins = [empty] * self.num_perm
+        for index in range(len(words) - SHINGLE_SIZE + 1):
+            value = hash(tuple(words[index:index + SHINGLE_SIZE])) & HASH_MASK
+            slot = value & (self.num_perm - 1)
+            value >>= self.bin_bits
+            if value < bins[slot]:
+                bins[slot] = value
+
+        signature = list(bins)
+        for slot in range(self.num_perm):
+            distance = 1
+            while signature[slot] == empty:
+                source = bins[(slot + distance) % self.num_perm]
+                if source != empty:
+                    signature[slot] = source + distance * empty
+                distance += 1
+        return tuple(signature)
+
+    def get_band_keys(self, signature):
+        return [(band, signature[band * self.rows_per_band:(band + 1) * self.rows_per_band])
+                for band in range(self.bands)]
+
+    def get_similarity(self, first, second):
+        return sum(a == b for a, b in zip(first, second)) / self.num_perm
+
+    def find(self, signature):
+        candidates = set()
+        for key in self.get_band_keys(signature):
+            candidates.update(self.buckets.get(key, ()))
+
+        best_url, best_similarity = None, self.threshold
+        for url in candidates:
+            similarity = self.get_similarity(signature, self.entries[url][0])
+            if similarity >= best_similarity:
+                best_url, best_similarity = url, similarity
+        return best_url
+
+    def add(self, url, signature, added_at):
+        self.entries[url] = (signature, added_at)
+        for key in self.get_band_keys(signature):
+            self.buckets.setdefault(key, set()).add(url)
+        self.order.append((added_at, url))
+
+    def remove(self, url):
+        signature, _ = self.entries.pop(url)
+        for key in self.get_band_keys(signature):
+            bucket = self.buckets.get(key)
+            if bucket is not None:
+                bucket.discard(url)
+                if not bucket:
+                    del self.buckets[key]
+
+    def evict(self):
+        cutoff = datetime.now() - timedelta(seconds=self.window)
+        while self.order and self.order[0][0] < cutoff:
+            added_at, url = self.order.popleft()
+            if url in self.entries and self.entries[url][1] == added_at:
+                self.remove(url)
+
+    def check(self, url, text, added_at=None):
+        if not url:
+            return None
+
+        signature = self.get_signature(text)
+        with self.lock:
+            if signature is None or url in self.entries:
+                return None
+
+            self.evict()
+            canonical_url = self.find(signature)
+            if canonical_url is None:
+                self.add(url, signature, added_at or datetime.now())
+            return canonical_url
+
+    def load(self):
+        started = time.monotonic()
+        cutoff = datetime.now() - timedelta(seconds=self.window)
+        rows = []
+        with self.engine.connect() as connection:
+            for source in self.sources:
+                table = source['model'].__table__
+                date_column = table.c[source['date']]
+                rows.extend(self.read_rows(connection, source, date_column >= cutoff))
+                self.last_ids[table.name] = connection.execute(select(table.c.id).order_by(table.c.id.desc())
+                                                               .limit(1)).scalar() or 0
+
+        with self.lock:
+            for added_at, url, text in sorted(rows, key=lambda row: row[0]):
+                signature = self.get_signature(text)
+                if signature is not None and url not in self.entries and self.find(signature) is None:
+                    self.add(url, signature, added_at)
+        self.refreshed_at = time.monotonic()
+        print(f"Индекс дубликатов: загружено {len(self.entries)} записей за {time.monotonic() - started:.1f} с.")
+
+    def refresh(self):
+        if time.monotonic() - self.refreshed_at < self.refresh_interval:
+            return
+        self.refreshed_at = time.monotonic()
+
+        rows = []
+        with self.engine.connect() as connection:
+            for source in self.sources:
+                table = source['model'].__table__
+                last_id = self.last_ids.get(table.name, 0)
+                source_rows = self.read_rows(connection, source, table.c.id > last_id, with_id=True)
+                for row_id, added_at, url, text in source_rows:
+                    last_id = max(last_id, row_id)
+                    rows.append((added_at, url, text))
+                self.last_ids[table.name] = last_id
+
+        for added_at, url, text in sorted(rows, key=lambda row: row[0]):
+            self.check(url, text, added_at)
+
+    def read_rows(self, connection, source, condition, with_id=False):
+        table = source['model'].__table__
+        columns = [table.c[source['date']], table.c[source['url']]] + [table.c[name] for name in source['text']]
+        if with_id:
+            columns.insert(0, table.c.id)
+        statement = select(*columns).where(condition, table.c.duplicate_of.is_(None))
+
+        rows = []
+        for row in connection.execute(statement):
+            *prefix, added_at, url = row[:len(columns) - len(source['text'])]
+            if added_at is None:
+                continue
+            rows.append((*prefix, added_at, url, ' '.join(value or '' for value in row[len(prefix) + 2:])))
+        return rows
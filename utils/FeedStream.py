@@ -0,0 +1,194 @@
+import xml.etree.ElementTree as ElementTree
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import feedparser
+# Санитайзер feedparser не входит в его публичный API, поэтому версия закреплена в requirements.txt
+from feedparser.mixin import _FeedParserMixin
+from feedparser.sanitizer import _sanitize_html
+
+ENTRY_TAGS = {'item', 'entry'}
+PUBLISHED_TAGS = {'pubDate', 'published', 'issued'}
+UPDATED_TAGS = {'updated', 'modified', 'date'}
+RDF_ABOUT = '{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about'
+FEED_HINT_TAGS = {'ttl': 'ttl', 'updatePeriod': 'sy_updateperiod', 'updateFrequency': 'sy_updatefrequency'}
+FEED_LINK_RELS = {'hub', 'self'}
+ATOM_NAMESPACE = '{http://www.w3.org/2005/Atom}'
+HTML_TYPES = {'html', 'text/html'}
+XHTML_TYPES = {'xhtml', 'application/xhtml+xml'}
+
+
+def get_local_name(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def parse_date(value):
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            date = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date.astimezone(timezone.utc).timetuple()
+
+
+def strip_namespaces(element):
+    for child in element.iter():
+        if isinstance(child.tag, str):
+            child.tag = get_local_name(child.tag)
+    return element
+
+
+def get_inner_xml(element):
+    children = list(element)
+    if len(children) == 1 and children[0].tag.endswith('div') and not (element.text or '').strip():
+        element = children[0]
+    parts = [element.text or '']
+    for child in element:
+        parts.append(ElementTree.tostring(strip_namespaces(child), encoding='unicode'))
+    return ''.join(parts).strip()
+
+
+def get_raw_content(element):
+    content_type = element.get('type', '').lower()
+    if content_type in XHTML_TYPES:
+        return 'xhtml', get_inner_xml(element)
+
+    text = ''.join(element.itertext()).strip()
+    if element.tag.startswith(ATOM_NAMESPACE):
+        return 'html' if content_type in HTML_TYPES else 'text', text
+    if get_local_name(element.tag) == 'title':
+        return 'guess', text
+    return 'html', text
+
+
+def sanitize_content(kind, text):
+    if kind == 'guess':
+        kind = 'html' if _FeedParserMixin.looks_like_html(text) else 'text'
+    if kind == 'text':
+        return text
+    return _sanitize_html(text, 'utf-8', 'application/xhtml+xml' if kind == 'xhtml' else 'text/html')
+
+
+def sanitize_feed(feed):
+    for entry in feed.entries:
+        for name, (kind, text) in entry.pop('raw', {}).items():
+            entry[name] = sanitize_content(kind, text)
+    return feed
+
+
+def make_entry(element):
+    entry = feedparser.FeedParserDict()
+    raw = {}
+    permalink = None
+    for child in element:
+        name = get_local_name(child.tag)
+        text = ''.join(child.itertext()).strip()
+        if name == 'title':
+            raw['title'] = get_raw_content(child)
+        elif name == 'link':
+            href = child.get('href')
+            if href is None:
+                entry.setdefault('link', text)
+            elif child.get('rel', 'alternate') == 'alternate':
+                entry.setdefault('link', href)
+        elif name in ('guid', 'id'):
+            entry['id'] = text
+            if name == 'guid' and child.get('isPermaLink', 'true').lower() != 'false':
+                permalink = text
+        elif name in ('description', 'summary'):
+            raw['summary'] = get_raw_content(child)
+        elif name in ('encoded', 'content'):
+            raw.setdefault('summary', get_raw_content(child))
+        elif name in PUBLISHED_TAGS and text:
+            entry.setdefault('published_parsed', parse_date(text))
+        elif name in UPDATED_TAGS and text:
+            entry.setdefault('updated_parsed', parse_date(text))
+    if element.get(RDF_ABOUT):
+        entry.setdefault('id', element.get(RDF_ABOUT))
+    if permalink:
+        entry.setdefault('link', permalink)
+    if raw:
+        entry['raw'] = raw
+    return entry
+
+
+def parse_feed(body):
+    parsed = feedparser.parse(body)
+    feed = {key: parsed.feed[key] for key in FEED_HINT_TAGS.values() if key in parsed.feed}
+    feed['links'] = [link for link in parsed.feed.get('links', []) if link.get('rel') in FEED_LINK_RELS]
+    return feedparser.FeedParserDict(entries=parsed.entries, feed=feedparser.FeedParserDict(feed))
+
+
+class FeedStream:
+    def __init__(self, is_seen, stop_after=3):
+        self.parser = ElementTree.XMLPullParser(events=('start', 'end'))
+        self.is_seen = is_seen
+        self.stop_after = stop_after
+        self.chunks = []
+        self.entries = []
+        self.feed_info = feedparser.FeedParserDict(links=[])
+        self.entry_depth = 0
+        self.seen_in_row = 0
+        self.last_date = None
+        self.newest_first = True
+        self.failed = False
+
+    def feed(self, chunk):
+        self.chunks.append(chunk)
+        if self.failed:
+            return False
+
+        try:
+            self.parser.feed(chunk)
+            for event, element in self.parser.read_events():
+                name = get_local_name(element.tag)
+                if name in ENTRY_TAGS:
+                    self.entry_depth += 1 if event == 'start' else -1
+                if event == 'start' or self.entry_depth:
+                    continue
+                if name not in ENTRY_TAGS:
+                    self.read_feed_element(name, element)
+                    continue
+
+                entry = make_entry(element)
+                element.clear()
+                self.entries.append(entry)
+                self.check_order(entry)
+                self.seen_in_row = self.seen_in_row + 1 if self.is_seen(entry) else 0
+                # Обрываем загрузку только для лент, где записи идут от новых к старым
+                if self.newest_first and self.seen_in_row >= self.stop_after:
+                    return True
+        except ElementTree.ParseError:
+            self.failed = True
+        return False
+
+    def check_order(self, entry):
+        date = entry.get('published_parsed') or entry.get('updated_parsed')
+        if date is None:
+            return
+        if self.last_date is not None and date > self.last_date:
+            self.newest_first = False
+        self.last_date = date
+
+    def read_feed_element(self, name, element):
+        if name in FEED_HINT_TAGS:
+            self.feed_info[FEED_HINT_TAGS[name]] = (element.text or '').strip()
+        elif name == 'link' and element.get('rel') in FEED_LINK_RELS and element.get('href'):
+            self.feed_info['links'].append({'rel': element.get('rel'), 'href': element.get('href')})
+
+    def close(self, complete=True):
+        if complete and not self.failed:
+            try:
+                self.parser.close()
+            except ElementTree.ParseError:
+                self.failed = True
+
+        if self.failed or not self.entries and complete:
+            return None
+        return feedparser.FeedParserDict(entries=self.entries, feed=self.feed_info)
+
+    def get_body(self):
+        return b''.join(self.chunks)
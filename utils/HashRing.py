@@ -0,0 +1,34 @@
+import bisect
+from hashlib import md5
+
+
+class HashRing:
+    def __init__(self, nodes=(), replicas=100):
+        self.replicas = replicas
+        self.points = []
+        self.nodes = {}
+        for node in nodes:
+            self.add(node)
+
+    def get_hash(self, value):
+        return int.from_bytes(md5(value.encode('utf-8')).digest()[:8], 'big')
+
+    def add(self, node):
+        for replica in range(self.replicas):
+            point = self.get_hash(f"{node}#{replica}")
+            if point not in self.nodes:
+                bisect.insort(self.points, point)
+            self.nodes[point] = node
+
+    def remove(self, node):
+        for replica in range(self.replicas):
+            point = self.get_hash(f"{node}#{replica}")
+            if self.nodes.get(point) == node:
+                del self.nodes[point]
+                self.points.remove(point)
+
+    def get(self, key):
+        if not self.points:
+            return None
+        index = bisect.bisect(self.points, self.get_hash(key)) % len(self.points)
+        return self.nodes[self.points[index]]
@@ -0,0 +1,105 @@
+import os
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as FastHTMLParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as FastHTMLParser
+    except ImportError:
+        FastHTMLParser = None
+
+try:
+    import lxml
+except ImportError:
+    lxml = None
+
+HTML_PARSER = os.getenv('HTML_PARSER', 'auto')
+
+
+class SubtreeStrainer(SoupStrainer):
+    def __init__(self, strainers):
+        super().__init__()
+        self.strainers = strainers
+
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        for strainer in self.strainers:
+            found = strainer.search_tag(markup_name, markup_attrs)
+            if found:
+                return found
+        return None
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return any(strainer.allow_tag_creation(nsprefix, name, attrs) for strainer in self.strainers)
+
+    def allow_string_creation(self, string):
+        return any(strainer.allow_string_creation(string) for strainer in self.strainers)
+
+
+def match_classes(class_names):
+    required = set(class_names.split())
+
+    def matches(value):
+        if not value:
+            return False
+        if not isinstance(value, str):
+            value = ' '.join(value)
+        return required <= set(value.split())
+
+    return matches
+
+
+def make_strainer(name, attrs):
+    if 'class' in attrs:
+        attrs = {**attrs, 'class': match_classes(attrs['class'])}
+    return SoupStrainer(name, attrs)
+
+
+def get_tree_builder():
+    if HTML_PARSER != 'html.parser' and lxml is not None:
+        return 'lxml'
+    return 'html.parser'
+
+
+def use_fast_parser():
+    return HTML_PARSER in ('auto', 'selectolax') and FastHTMLParser is not None
+
+
+def get_css_selector(name, attrs):
+    selector = name or ''
+    for key, value in attrs.items():
+        if key == 'class':
+            selector += ''.join(f".{class_name}" for class_name in value.split())
+        else:
+            selector += f'[{key}="{value}"]'
+    return selector or '*'
+
+
+def select_fragment(markup, subtrees):
+    tree = FastHTMLParser(markup)
+    nodes = tree.css(', '.join(get_css_selector(name, attrs) for name, attrs in subtrees))
+    node_ids = {node.mem_id for node in nodes}
+
+    fragment = []
+    for node in nodes:
+        parent = node.parent
+        while parent is not None and parent.mem_id not in node_ids:
+            parent = parent.parent
+        if parent is None:
+            fragment.append(node.html)
+    return ''.join(fragment)
+
+
+def make_soup(markup, subtrees=None):
+    builder = get_tree_builder()
+    if not subtrees:
+        return BeautifulSoup(markup, builder)
+
+    if use_fast_parser():
+        return BeautifulSoup(select_fragment(markup, subtrees), builder)
+
+    if len(subtrees) == 1:
+        strainer = make_strainer(*subtrees[0])
+    else:
+        strainer = SubtreeStrainer([make_strainer(name, attrs) for name, attrs in subtrees])
+    return BeautifulSoup(markup, builder, parse_only=strainer)
@@ -0,0 +1,34 @@
+from utils.JsonStore import JsonStore
+
+HTTP_CACHE_FILE = 'data/http_cache.json'
+
+
+class ValidatorCache:
+    def __init__(self, path=HTTP_CACHE_FILE):
+        self.store = JsonStore(path)
+
+    def get_headers(self, url):
+        validators = self.store.get(url, {})
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+
+    def update(self, url, headers):
+        headers = {key.lower(): value for key, value in headers.items()}
+        validators = {
+            'etag': headers.get('etag'),
+            'last_modified': headers.get('last-modified'),
+        }
+
+        if not any(validators.values()):
+            if self.store.get(url) is not None:
+                self.store.delete(url)
+                self.store.save()
+            return
+
+        if self.store.get(url) != validators:
+            self.store.set(url, validators)
+            self.store.save()
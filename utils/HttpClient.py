@@ -0,0 +1,48 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse
+from urllib3.util.retry import Retry
+
+
+class HttpClient:
+    def __init__(self, headers, max_connections, max_connections_per_host, connect_timeout, read_timeout,
+                 retries, insecure_hosts=()):
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.5,
+            backoff_jitter=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=max_connections, pool_maxsize=max_connections_per_host,
+                              max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.timeout = (connect_timeout, read_timeout)
+        self.insecure_hosts = set(insecure_hosts)
+        self.max_connections_per_host = max_connections_per_host
+        self.connections = threading.BoundedSemaphore(max_connections)
+        self.host_connections = {}
+        self.host_lock = threading.Lock()
+
+    def get_host_connections(self, host):
+        with self.host_lock:
+            if host not in self.host_connections:
+                self.host_connections[host] = threading.BoundedSemaphore(self.max_connections_per_host)
+            return self.host_connections[host]
+
+    def get(self, url, **kwargs):
+        host = urlparse(url).hostname
+        kwargs.setdefault('timeout', self.timeout)
+        kwargs.setdefault('verify', host not in self.insecure_hosts)
+        with self.get_host_connections(host), self.connections:
+            return self.session.get(url, **kwargs)
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,54 @@
+import json
+import os
+import threading
+
+
+class JsonStore:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.changed = set()
+        self.data = self.read()
+
+    def read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def get(self, key, default=None):
+        with self.lock:
+            return self.data.get(key, default)
+
+    def items(self):
+        with self.lock:
+            return list(self.data.items())
+
+    def set(self, key, value):
+        with self.lock:
+            self.data[key] = value
+            self.changed.add(key)
+
+    def delete(self, key):
+        with self.lock:
+            self.data.pop(key, None)
+            self.changed.add(key)
+
+    def save(self):
+        with self.lock:
+            if not self.changed:
+                return
+
+            data = self.read()
+            for key in self.changed:
+                if key in self.data:
+                    data[key] = self.data[key]
+                else:
+                    data.pop(key, None)
+
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump(data, file, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+            self.changed.clear()
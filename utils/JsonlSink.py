@@ -0,0 +1,141 @@
+import gzip
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import date
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dump_line(item):
+    if orjson is not None:
+        return orjson.dumps(item, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(item, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+def truncate_partial_line(path):
+    try:
+        with open(path, 'rb+') as file:
+            size = file.seek(0, os.SEEK_END)
+            position = size
+            while position > 0:
+                chunk_start = max(0, position - 65536)
+                file.seek(chunk_start)
+                chunk = file.read(position - chunk_start)
+                newline = chunk.rfind(b'\n')
+                if newline != -1:
+                    position = chunk_start + newline + 1
+                    break
+                position = chunk_start
+            if position != size:
+                file.truncate(position)
+    except FileNotFoundError:
+        pass
+
+
+class JsonlSink:
+    def __init__(self, path, key_fields, max_bytes=64 * 1024 * 1024, compress=True, buffer_size=100,
+                 flush_interval=5):
+        self.path = path
+        self.keys_path = os.path.splitext(path)[0] + '.keys'
+        self.key_fields = key_fields
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.lines = []
+        self.new_keys = []
+        self.buffered_at = None
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        truncate_partial_line(self.path)
+        self.keys = None
+        if key_fields:
+            truncate_partial_line(self.keys_path)
+            self.keys = self.load_keys()
+        self.segment_date = self.get_segment_date()
+
+    def load_keys(self):
+        try:
+            with open(self.keys_path, 'r', encoding='utf-8') as file:
+                return {line.rstrip('\n') for line in file}
+        except FileNotFoundError:
+            return set()
+
+    def get_segment_date(self):
+        try:
+            return date.fromtimestamp(os.path.getmtime(self.path))
+        except FileNotFoundError:
+            return date.today()
+
+    def get_key(self, item):
+        return '_'.join(str(item[field]) for field in self.key_fields).replace('\n', ' ')
+
+    def add(self, item):
+        key = self.get_key(item) if self.keys is not None else None
+        with self.lock:
+            if key is not None:
+                if key in self.keys:
+                    return False
+                self.keys.add(key)
+                self.new_keys.append(key)
+            self.lines.append(dump_line(item))
+            if self.buffered_at is None:
+                self.buffered_at = time.monotonic()
+            flush_due = (len(self.lines) >= self.buffer_size or
+                         time.monotonic() - self.buffered_at >= self.flush_interval)
+        if flush_due:
+            self.flush()
+        return True
+
+    def flush(self):
+        with self.lock:
+            if not self.lines:
+                return
+
+            self.rotate_if_needed()
+            with open(self.path, 'ab') as file:
+                file.write(b''.join(self.lines))
+            if self.new_keys:
+                with open(self.keys_path, 'a', encoding='utf-8') as file:
+                    file.write(''.join(f"{key}\n" for key in self.new_keys))
+            self.lines, self.new_keys, self.buffered_at = [], [], None
+
+    def rotate_if_needed(self):
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            self.segment_date = date.today()
+            return
+
+        today = date.today()
+        if size and (size >= self.max_bytes or self.segment_date != today):
+            self.rotate()
+        self.segment_date = today
+
+    def get_rotated_path(self):
+        base = os.path.splitext(self.path)[0]
+        number = 1
+        while True:
+            rotated_path = f"{base}.{self.segment_date.isoformat()}.{number}.jsonl"
+            if not os.path.exists(rotated_path) and not os.path.exists(f"{rotated_path}.gz"):
+                return rotated_path
+            number += 1
+
+    def rotate(self):
+        rotated_path = self.get_rotated_path()
+        os.replace(self.path, rotated_path)
+        if not self.compress:
+            return
+
+        with open(rotated_path, 'rb') as source, gzip.open(f"{rotated_path}.gz", 'wb') as target:
+            shutil.copyfileobj(source, target)
+        os.remove(rotated_path)
@@ -0,0 +1,104 @@
+import heapq
+import random
+import time
+
+
+class PollScheduler:
+    def __init__(self, min_interval, max_interval, initial_interval, target_items=1.0, smoothing=0.3):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = min(max(initial_interval, min_interval), max_interval)
+        self.target_items = target_items
+        self.smoothing = smoothing
+        self.queue = []
+        self.sources = {}
+
+    def add(self, name, delay=0, saved_state=None):
+        if name in self.sources:
+            return
+
+        saved_state = saved_state or {}
+        self.sources[name] = {
+            'interval': min(max(saved_state.get('interval', self.initial_interval), self.min_interval),
+                            self.max_interval),
+            'rate': saved_state.get('rate'),
+            'errors': 0,
+            'last_poll': None,
+            'due': None,
+        }
+        self.schedule(name, delay)
+
+    def get_saved_state(self, name):
+        state = self.sources[name]
+        return {'interval': state['interval'], 'rate': state['rate']}
+
+    def remove(self, name):
+        self.sources.pop(name, None)
+
+    def schedule(self, name, delay):
+        state = self.sources[name]
+        state['due'] = time.monotonic() + delay
+        heapq.heappush(self.queue, (state['due'], name))
+
+    def drop_stale(self):
+        while self.queue:
+            due, name = self.queue[0]
+            state = self.sources.get(name)
+            if state is not None and state['due'] == due:
+                break
+            heapq.heappop(self.queue)
+
+    def pop_due(self):
+        now = time.monotonic()
+        names = []
+        self.drop_stale()
+        while self.queue and self.queue[0][0] <= now:
+            _, name = heapq.heappop(self.queue)
+            self.sources[name]['due'] = None
+            names.append(name)
+            self.drop_stale()
+        return names
+
+    def time_until_next(self):
+        self.drop_stale()
+        if not self.queue:
+            return self.max_interval
+        return max(0.0, self.queue[0][0] - time.monotonic())
+
+    def next_interval(self, state):
+        if state['rate'] is None:
+            return state['interval']
+        if state['rate'] == 0:
+            return min(state['interval'] * 1.5, self.max_interval)
+        return min(max(self.target_items / state['rate'], self.min_interval), self.max_interval)
+
+    def record_success(self, name, new_items, min_delay=None):
+        state = self.sources.get(name)
+        if state is None:
+            return
+
+        now = time.monotonic()
+        if state['last_poll'] is not None:
+            observed = new_items / max(now - state['last_poll'], 1.0)
+            if state['rate'] is None:
+                state['rate'] = observed
+            else:
+                state['rate'] = self.smoothing * observed + (1 - self.smoothing) * state['rate']
+        state['last_poll'] = now
+        state['errors'] = 0
+        state['interval'] = self.next_interval(state)
+        delay = state['interval']
+        if min_delay:
+            delay = min(max(delay, min_delay), self.max_interval)
+        self.schedule(name, delay)
+
+    def record_error(self, name):
+        state = self.sources.get(name)
+        if state is None:
+            return
+
+        state['errors'] += 1
+        delay = min(state['interval'] * 2 ** state['errors'], self.max_interval)
+        self.schedule(name, delay * random.uniform(0.9, 1.1))
+        return delay
+
@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+
+class RateLimiter:
+    def __init__(self, rate, capacity=None, min_rate=1.0, recovery=0.05):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.capacity = capacity or rate
+        self.recovery = recovery
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = {}
+        self.lock = asyncio.Lock()
+        self.waiting = 0
+        self.total_requests = 0
+        self.total_wait = 0.0
+        self.flood_waits = 0
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + max(0.0, now - self.updated_at) * self.rate)
+        self.updated_at = max(self.updated_at, now)
+
+    def time_until_resume(self, key=None):
+        now = time.monotonic()
+        return max(0.0, self.paused_until.get(key, 0) - now, self.paused_until.get(None, 0) - now)
+
+    async def acquire(self, key=None):
+        started = time.monotonic()
+        self.waiting += 1
+        try:
+            while self.time_until_resume(key):
+                await asyncio.sleep(self.time_until_resume(key))
+
+            async with self.lock:
+                while True:
+                    self.refill(time.monotonic())
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        break
+                    await asyncio.sleep((1 - self.tokens) / self.rate)
+        finally:
+            self.waiting -= 1
+        self.total_requests += 1
+        self.total_wait += time.monotonic() - started
+
+    def record_success(self):
+        self.rate = min(self.max_rate, self.rate + self.recovery)
+
+    def record_flood_wait(self, seconds, key=None):
+        self.flood_waits += 1
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.tokens = 0
+        self.paused_until[key] = max(self.paused_until.get(key, 0), time.monotonic() + seconds)
+
+    def get_status(self):
+        return {
+            'rate': round(self.rate, 2),
+            'waiting': self.waiting,
+            'requests': self.total_requests,
+            'average_wait': round(self.total_wait / self.total_requests, 3) if self.total_requests else 0.0,
+            'flood_waits': self.flood_waits,
+        }
@@ -0,0 +1,210 @@
+import asyncio
+import hashlib
+import hmac
+import secrets
+import time
+from urllib.parse import urlparse
+from aiohttp import web
+from utils.JsonStore import JsonStore
+
+WEBSUB_FILE = 'data/websub.json'
+SIGNATURE_METHODS = {'sha1', 'sha256', 'sha384', 'sha512'}
+VERIFY_TIMEOUT = 3600
+CHECK_INTERVAL = 60
+
+
+def find_hub(feed, links):
+    hub = topic = None
+    for link in feed.get('feed', {}).get('links', []):
+        if link.get('rel') == 'hub' and hub is None:
+            hub = link.get('href')
+        elif link.get('rel') == 'self' and topic is None:
+            topic = link.get('href')
+
+    if hub is None and 'hub' in links:
+        hub = str(links['hub']['url'])
+    if topic is None and 'self' in links:
+        topic = str(links['self']['url'])
+    return hub, topic
+
+
+class WebSubSubscriber:
+    def __init__(self, callback_url, on_content, lease_seconds, path=WEBSUB_FILE):
+        self.callback_url = callback_url.rstrip('/')
+        self.on_content = on_content
+        self.lease_seconds = lease_seconds
+        self.subscriptions = JsonStore(path)
+        self.session = None
+        self.runner = None
+        self.tasks = set()
+
+    def get_app(self):
+        app = web.Application()
+        route = f"{urlparse(self.callback_url).path}/{{token}}"
+        app.router.add_get(route, self.handle_verification)
+        app.router.add_post(route, self.handle_content)
+        return app
+
+    async def start(self, session, host, port):
+        self.session = session
+        self.runner = web.AppRunner(self.get_app())
+        await self.runner.setup()
+        await web.TCPSite(self.runner, host, port).start()
+        self.create_task(self.maintain())
+        print(f"WebSub: приём уведомлений на {host}:{port}, адрес для хабов {self.callback_url}.")
+
+    async def stop(self):
+        for task in list(self.tasks):
+            task.cancel()
+        if self.runner is not None:
+            await self.runner.cleanup()
+
+    def create_task(self, coroutine):
+        task = asyncio.create_task(coroutine)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    def find_feed(self, token):
+        for url, subscription in self.subscriptions.items():
+            if subscription['token'] == token:
+                return url, subscription
+        return None, None
+
+    def is_active(self, url):
+        subscription = self.subscriptions.get(url)
+        return bool(subscription and subscription['mode'] == 'subscribe' and
+                    subscription['expires'] > time.time())
+
+    def discover(self, url, feed, links):
+        hub, topic = find_hub(feed, links)
+        if hub is None:
+            return
+
+        topic = topic or url
+        subscription = self.subscriptions.get(url)
+        if subscription and subscription['hub'] == hub and subscription['topic'] == topic:
+            return
+        self.create_task(self.subscribe(url, hub, topic))
+
+    async def subscribe(self, url, hub, topic):
+        subscription = self.subscriptions.get(url) or {}
+        if subscription.get('hub') != hub or subscription.get('topic') != topic:
+            subscription = {}
+
+        subscription = {
+            'hub': hub,
+            'topic': topic,
+            'token': subscription.get('token') or secrets.token_hex(16),
+            'secret': subscription.get('secret') or secrets.token_hex(32),
+            'mode': 'subscribe',
+            'requested': time.time(),
+            'expires': subscription.get('expires', 0),
+            'renew': time.time() + VERIFY_TIMEOUT,
+        }
+        self.subscriptions.set(url, subscription)
+        self.subscriptions.save()
+        await self.send_request(url, subscription, {'hub.secret': subscription['secret'],
+                                                    'hub.lease_seconds': str(self.lease_seconds)})
+
+    async def unsubscribe(self, url):
+        subscription = self.subscriptions.get(url)
+        if subscription is None:
+            return
+
+        subscription = {**subscription, 'mode': 'unsubscribe', 'requested': time.time()}
+        self.subscriptions.set(url, subscription)
+        self.subscriptions.save()
+        await self.send_request(url, subscription, {})
+
+    async def send_request(self, url, subscription, extra):
+        data = {
+            'hub.callback': f"{self.callback_url}/{subscription['token']}",
+            'hub.mode': subscription['mode'],
+            'hub.topic': subscription['topic'],
+            **extra,
+        }
+        try:
+            async with self.session.post(subscription['hub'], data=data) as response:
+                if response.status not in (202, 204):
+                    print(f"WebSub: хаб {subscription['hub']} отклонил запрос для {url}: {response.status}.")
+        except Exception as e:
+            print(f"WebSub: ошибка запроса к хабу {subscription['hub']}: {str(e)}.")
+
+    async def maintain(self):
+        while True:
+            for url, subscription in self.subscriptions.items():
+                try:
+                    await self.maintain_subscription(url, subscription)
+                except Exception as e:
+                    print(f"WebSub: ошибка обслуживания подписки на {url}: {str(e)}.")
+            await asyncio.sleep(CHECK_INTERVAL)
+
+    async def maintain_subscription(self, url, subscription):
+        now = time.time()
+        if subscription['mode'] == 'denied':
+            return
+        if subscription['mode'] == 'unsubscribe':
+            if now - subscription['requested'] > VERIFY_TIMEOUT:
+                self.subscriptions.delete(url)
+                self.subscriptions.save()
+        elif subscription['expires'] > now:
+            if now >= subscription['renew']:
+                await self.subscribe(url, subscription['hub'], subscription['topic'])
+        elif now - subscription['requested'] > VERIFY_TIMEOUT:
+            await self.subscribe(url, subscription['hub'], subscription['topic'])
+
+    async def handle_verification(self, request):
+        url, subscription = self.find_feed(request.match_info['token'])
+        query = request.query
+        if subscription is None or query.get('hub.topic') != subscription['topic']:
+            return web.Response(status=404)
+
+        mode = query.get('hub.mode')
+        if mode == 'denied':
+            print(f"WebSub: хаб отказал в подписке на {url}: {query.get('hub.reason', '')}.")
+            self.subscriptions.set(url, {**subscription, 'mode': 'denied', 'expires': 0})
+            self.subscriptions.save()
+            return web.Response()
+
+        if mode != subscription['mode'] or 'hub.challenge' not in query:
+            return web.Response(status=404)
+
+        if mode == 'subscribe':
+            try:
+                lease_seconds = int(query.get('hub.lease_seconds', self.lease_seconds))
+            except ValueError:
+                lease_seconds = self.lease_seconds
+            now = time.time()
+            self.subscriptions.set(url, {**subscription, 'expires': now + lease_seconds,
+                                         'renew': now + lease_seconds * 0.9})
+            print(f"WebSub: подписка на {url} подтверждена на {lease_seconds} с.")
+        else:
+            self.subscriptions.delete(url)
+            print(f"WebSub: подписка на {url} отменена.")
+        self.subscriptions.save()
+        return web.Response(text=query['hub.challenge'])
+
+    async def handle_content(self, request):
+        url, subscription = self.find_feed(request.match_info['token'])
+        if subscription is None:
+            return web.Response(status=410)
+
+        body = await request.read()
+        method, _, signature = request.headers.get('X-Hub-Signature', '').partition('=')
+        if method not in SIGNATURE_METHODS:
+            print(f"WebSub: уведомление для {url} без подписи, пропускаем.")
+            return web.Response(status=202)
+
+        expected = hmac.new(subscription['secret'].encode(), body, getattr(hashlib, method)).hexdigest()
+        if not hmac.compare_digest(expected, signature):
+            print(f"WebSub: неверная подпись уведомления для {url}, пропускаем.")
+            return web.Response(status=202)
+
+        self.create_task(self.process_content(url, body))
+        return web.Response(status=202)
+
+    async def process_content(self, url, body):
+        try:
+            await self.on_content(url, body)
+        except Exception as e:
+            print(f"WebSub: ошибка обработки уведомления для {url}: {str(e)}.")